@@ -12,22 +12,155 @@ from __future__ import annotations
 import argparse
 import csv
 import os
+import queue
 import sys
-from dataclasses import dataclass
-from typing import Dict, Iterable, Iterator, List, Optional
-
-import requests
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is an optional, faster drop-in for the stdlib decoder
+    from json import loads as _json_loads
+
+try:
+    import ijson
+except ImportError:  # without ijson each page is decoded in one piece
+    ijson = None
 
 GRAPH_API_VERSION = "v19.0"
 BASE_URL = f"https://graph.facebook.com/{GRAPH_API_VERSION}"
+# 429 and 500 are retried by FacebookClient._send instead: throttling must wait out the
+# time Graph API estimates to regain access, and 500 is also used for "Please reduce the
+# amount of data", which must reach the page-size shrink immediately.
+RETRY_STATUS_CODES = (502, 503, 504)
+SERVER_ERROR_BACKOFF = 0.5
+MAX_SERVER_ERROR_RETRIES = 5
+DEFAULT_CONCURRENCY = 8
+DEFAULT_POOL_MAXSIZE = 64
+SHARD_QUEUE_SIZE = 1000
+DEFAULT_PAGE_LIMIT = 500
+COMMENT_FIELDS = "id,message,created_time,from{id,name},like_count,comment_count"
+INLINE_COMMENT_LIMIT = 100
+CSV_CHUNK_ROWS = 10_000
+CSV_BUFFER_SIZE = 1 << 20
+DEFAULT_CACHE_PATH = "fb_cache.sqlite"
+DEFAULT_CACHE_TTL = 3600
+USAGE_HEADERS = ("X-App-Usage", "X-Business-Use-Case-Usage")
+USAGE_PACING_THRESHOLD = 75  # percent of any Graph API quota
+THROTTLE_ERROR_CODES = frozenset({4, 17, 32, 613})
+THROTTLE_FALLBACK_DELAY = 60
+MAX_THROTTLE_RETRIES = 3
+POST_FIELDS = (
+    "id,message,created_time,"
+    f"comments.limit({INLINE_COMMENT_LIMIT}).order(chronological).summary(true){{{COMMENT_FIELDS}}}"
+)
 
 
 class FacebookAPIError(RuntimeError):
     """Raised when the Facebook Graph API returns a non-success response."""
 
 
-@dataclass
-class CommentRow:
+class FacebookPageTooLargeError(FacebookAPIError):
+    """Raised when the Graph API asks for a smaller page (\"Please reduce the amount of data\")."""
+
+
+def _usage_level(headers: Mapping[str, str]) -> float:
+    """
+    Return the highest quota percentage reported in the Graph API usage headers.
+
+    Pacing is best-effort, so a header that is missing or not shaped as documented
+    counts as zero usage.
+    """
+    level = 0.0
+    for name in USAGE_HEADERS:
+        try:
+            usage = _json_loads(headers.get(name) or "{}")
+            # X-App-Usage is a flat object; X-Business-Use-Case-Usage maps business IDs to lists of them.
+            entries = [usage] if name == "X-App-Usage" else [e for v in usage.values() for e in v]
+            for entry in entries:
+                for key in ("call_count", "total_cputime", "total_time"):
+                    level = max(level, float(entry.get(key) or 0))
+        except (ValueError, TypeError, AttributeError):
+            continue
+    return level
+
+
+def _regain_access_delay(headers: Mapping[str, str]) -> float:
+    """Return the seconds until a throttled app may call again, per X-Business-Use-Case-Usage."""
+    try:
+        usage = _json_loads(headers.get("X-Business-Use-Case-Usage") or "{}")
+        minutes = max(
+            (float(entry.get("estimated_time_to_regain_access") or 0) for v in usage.values() for entry in v),
+            default=0,
+        )
+    except (ValueError, TypeError, AttributeError):
+        minutes = 0
+    return minutes * 60 or THROTTLE_FALLBACK_DELAY
+
+
+def _is_throttled(response: requests.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    try:
+        payload = _json_loads(response.content)
+        return payload.get("error", {}).get("code") in THROTTLE_ERROR_CODES
+    except (ValueError, AttributeError):
+        return False
+
+
+def _without_access_token(url: str) -> str:
+    """Return ``url`` with any ``access_token`` query parameter removed."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "access_token"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _is_page_too_large(response: requests.Response) -> bool:
+    return b"reduce the amount of data" in response.content
+
+
+def _retry_delay(response: requests.Response, attempt: int) -> Optional[float]:
+    """Return the seconds to wait before retrying a failed response, or ``None`` to give up."""
+    if _is_throttled(response):
+        return _regain_access_delay(response.headers) if attempt < MAX_THROTTLE_RETRIES else None
+    if response.status_code == 500 and not _is_page_too_large(response):
+        return SERVER_ERROR_BACKOFF * 2**attempt if attempt < MAX_SERVER_ERROR_RETRIES else None
+    return None
+
+
+def _with_limit(url: str, limit: int) -> str:
+    """Return ``url`` with its ``limit`` query parameter replaced."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "limit"]
+    query.append(("limit", str(limit)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class CommentRow(NamedTuple):
+    """One exported comment; fields are in CSV column order, so rows can be written as-is."""
+
     post_id: str
     post_message: str
     post_created_time: str
@@ -54,32 +187,229 @@ class CommentRow:
         ]
 
 
+# Plain-tuple form of ``CommentRow`` used on the export hot path.
+RowTuple = Tuple[str, str, str, str, str, str, str, str, int, int]
+
+
+def _make_session(
+    cache_path: Optional[str] = None,
+    cache_ttl: Optional[int] = None,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+) -> requests.Session:
+    """
+    Build a ``requests.Session`` that keeps connections alive across paginated calls.
+
+    When ``cache_path`` is given and requests-cache is installed, GET responses are cached
+    in that SQLite file for ``cache_ttl`` seconds (forever if ``None``). The access token
+    is left out of cache keys and stored request URLs, but response bodies are cached as
+    received and Graph API embeds the token in their ``paging.next`` links, so the cache
+    file must be treated as a secret.
+
+    ``pool_maxsize`` should be at least the number of threads sharing the session.
+    """
+    # Imported here so ``--help`` and argument errors don't pay for loading requests/urllib3.
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session = _new_session(cache_path, cache_ttl)
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry))
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+
+def _new_session(cache_path: Optional[str], cache_ttl: Optional[int]) -> requests.Session:
+    import requests
+
+    if cache_path:
+        try:
+            from requests_cache import CachedSession
+        except ImportError:  # caching is an optional extra
+            pass
+        else:
+            return CachedSession(
+                cache_path,
+                backend="sqlite",
+                expire_after=-1 if cache_ttl is None else cache_ttl,
+                allowable_methods=("GET",),
+                ignored_parameters=["access_token"],
+            )
+    return requests.Session()
+
+
+def _stream_page(raw: IO[bytes]) -> Generator[Dict, None, Dict]:
+    """Yield items of a page's ``data`` array as they are parsed, returning its ``paging`` object."""
+    item_builder = None
+    paging_builder = ijson.ObjectBuilder()
+    for prefix, event, value in ijson.parse(raw, use_float=True):
+        if prefix == "data.item" or prefix.startswith("data.item."):
+            if item_builder is None:
+                item_builder = ijson.ObjectBuilder()
+            item_builder.event(event, value)
+            if prefix == "data.item" and event == "end_map":
+                yield item_builder.value
+                item_builder = None
+        elif prefix == "paging" or prefix.startswith("paging."):
+            paging_builder.event(event, value)
+    return paging_builder.value or {}
+
+
 @dataclass
 class FacebookClient:
     access_token: str
+    cache_path: Optional[str] = None
+    cache_ttl: Optional[int] = None
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+    _session: requests.Session = field(init=False, repr=False)
+    _resume_at: float = field(default=0.0, init=False, repr=False)
 
-    def _get(self, path: str, params: Optional[Dict[str, str]] = None) -> Dict:
+    def __post_init__(self) -> None:
+        self._session = _make_session(self.cache_path, self.cache_ttl, self.pool_maxsize)
+
+    def _get(
+        self,
+        path_or_url: str,
+        params: Optional[Dict[str, str]] = None,
+        *,
+        is_full_url: bool = False,
+    ) -> Dict:
+        return self._parse_response(self._send(path_or_url, params, is_full_url=is_full_url))
+
+    def _send(
+        self,
+        path_or_url: str,
+        params: Optional[Dict[str, str]] = None,
+        *,
+        is_full_url: bool = False,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Issue a GET request, pacing calls by the Graph API usage headers.
+
+        ``path_or_url`` is a path relative to ``BASE_URL``, or with ``is_full_url`` a
+        complete URL such as ``paging.next``. Either way the client's current access token
+        is sent, replacing any token baked into the URL (e.g. an expired one from a cached
+        page).
+
+        Once any reported quota passes ``USAGE_PACING_THRESHOLD`` percent, the next calls
+        are held back exponentially; the pause happens before the next request rather than
+        while a streamed response still holds its pooled connection. A throttled request is
+        retried after the time Graph API estimates it needs to regain access, and other
+        HTTP 500 errors with exponential backoff, except "reduce the amount of data", which
+        is returned straight away.
+        """
         params = params or {}
         params.setdefault("access_token", self.access_token)
-        url = f"{BASE_URL}/{path}"
-        response = requests.get(url, params=params, timeout=30)
+        url = _without_access_token(path_or_url) if is_full_url else f"{BASE_URL}/{path_or_url}"
+        attempt = 0
+        while True:
+            pause = self._resume_at - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            response = self._session.get(url, params=params, timeout=30, stream=stream)
+            if getattr(response, "from_cache", False):
+                return response
+            if response.status_code == 200:
+                level = _usage_level(response.headers)
+                if level > USAGE_PACING_THRESHOLD:
+                    self._resume_at = max(self._resume_at, time.monotonic() + 2 ** (level / 20))
+                return response
+            delay = _retry_delay(response, attempt)
+            if delay is None:
+                return response
+            attempt += 1
+            response.close()
+            time.sleep(delay)
+
+    def _iter_get(
+        self,
+        path_or_url: str,
+        params: Optional[Dict[str, str]] = None,
+        *,
+        is_full_url: bool = False,
+    ) -> Generator[Dict, None, Dict]:
+        """
+        Yield the ``data`` items of a Graph API page and return its ``paging`` object.
+
+        With ijson installed the body is parsed while it downloads, so large feed pages
+        with inline comments are never held in memory as a whole.
+        """
+        with self._send(path_or_url, params, is_full_url=is_full_url, stream=ijson is not None) as response:
+            # requests-cache reads the whole body itself (``from_cache`` is set on every
+            # response it returns), so there is nothing left to stream.
+            if ijson is None or getattr(response, "from_cache", None) is not None:
+                payload = self._parse_response(response)
+                yield from payload.get("data", [])
+                return payload.get("paging", {})
+            if response.status_code != 200:
+                self._parse_response(response)
+            response.raw.decode_content = True
+            try:
+                return (yield from _stream_page(response.raw))
+            except ijson.JSONError as exc:
+                raise FacebookAPIError(f"Invalid JSON from Graph API: {exc}") from exc
+
+    @staticmethod
+    def _parse_response(response: requests.Response) -> Dict:
         if response.status_code != 200:
             try:
-                payload = response.json()
+                payload = _json_loads(response.content)
                 message = payload.get("error", {}).get("message", response.text)
             except ValueError:
                 message = response.text
+            if "reduce the amount of data" in message:
+                raise FacebookPageTooLargeError(f"Graph API request failed ({response.status_code}): {message}")
             raise FacebookAPIError(f"Graph API request failed ({response.status_code}): {message}")
         try:
-            return response.json()
+            return _json_loads(response.content)
         except ValueError as exc:
             raise FacebookAPIError(f"Invalid JSON from Graph API: {response.text}") from exc
 
+    def _iter_items(self, path: str, params: Dict[str, str]) -> Iterator[Dict]:
+        """
+        Yield the ``data`` items of every page of ``path`` by following ``paging.next``.
+
+        Whenever the Graph API rejects a page as too large, the ``limit`` parameter is
+        halved and the same page is requested again.
+        """
+        limit = int(params["limit"])
+        page_limit = limit
+        next_url = None
+        while True:
+            if next_url is None:
+                page = self._iter_get(path, params={**params, "limit": str(limit)})
+            else:
+                url = next_url if limit == page_limit else _with_limit(next_url, limit)
+                page = self._iter_get(url, is_full_url=True)
+            try:
+                # The status is checked before any item is yielded, so a rejected page
+                # never produces partial output.
+                paging = yield from page
+            except FacebookPageTooLargeError:
+                if limit <= 1:
+                    raise
+                limit //= 2
+                continue
+            page_limit = limit
+
+            cursors = paging.get("cursors", {})
+            after = cursors.get("after")
+            next_url = paging.get("next") if after else None
+            if not next_url:
+                return
+
     def iter_group_posts(
         self,
         group_id: str,
         *,
-        limit: int = 100,
+        limit: int = DEFAULT_PAGE_LIMIT,
         since: Optional[str] = None,
         until: Optional[str] = None,
         max_posts: Optional[int] = None,
@@ -87,6 +417,10 @@ class FacebookClient:
         """
         Iterate through posts in the group feed.
 
+        The first page of each post's comments is requested inline through field
+        expansion and is available as ``post["comments"]`` (absent when a post has none),
+        together with a ``summary.total_count`` of the post's comments.
+
         Args:
             group_id: Numeric group ID.
             limit: Max number of posts to fetch per page (Graph API limit parameter).
@@ -97,7 +431,7 @@ class FacebookClient:
 
         params: Dict[str, str] = {
             "limit": str(limit),
-            "fields": "id,message,created_time",
+            "fields": POST_FIELDS,
         }
         if since:
             params["since"] = since
@@ -105,58 +439,197 @@ class FacebookClient:
             params["until"] = until
 
         fetched = 0
-        next_url = None
-        while True:
-            payload = (
-                self._get(f"{group_id}/feed", params=params)
-                if next_url is None
-                else self._get(next_url.replace(f"{BASE_URL}/", ""))
-            )
-
-            data = payload.get("data", [])
-            for post in data:
-                yield post
-                fetched += 1
-                if max_posts is not None and fetched >= max_posts:
-                    return
-
-            paging = payload.get("paging", {})
-            cursors = paging.get("cursors", {})
-            after = cursors.get("after")
-            next_url = paging.get("next") if after else None
-            if not next_url:
+        for post in self._iter_items(f"{group_id}/feed", params):
+            yield post
+            fetched += 1
+            if max_posts is not None and fetched >= max_posts:
                 return
 
     def iter_comments(
         self,
         post_id: str,
         *,
-        limit: int = 100,
+        limit: int = DEFAULT_PAGE_LIMIT,
         order: str = "chronological",
+        after: Optional[str] = None,
     ) -> Iterator[Dict]:
-        """Iterate through comments on a post with pagination."""
+        """Iterate through comments on a post with pagination, optionally resuming from cursor ``after``."""
         params: Dict[str, str] = {
             "limit": str(limit),
             "order": order,
-            "fields": "id,message,created_time,from,like_count,comment_count",
+            "fields": COMMENT_FIELDS,
         }
-
-        next_url = None
-        while True:
-            payload = (
-                self._get(f"{post_id}/comments", params=params)
-                if next_url is None
-                else self._get(next_url.replace(f"{BASE_URL}/", ""))
+        if after:
+            params["after"] = after
+
+        yield from self._iter_items(f"{post_id}/comments", params)
+
+
+def _build_rows(post: Dict, comments: Iterable[Dict]) -> List[RowTuple]:
+    # The post columns are identical for every comment, so build them once.
+    prefix = (post.get("id", ""), post.get("message", ""), post.get("created_time", ""))
+    rows: List[RowTuple] = []
+    append = rows.append
+    for comment in comments:
+        get = comment.get
+        author = get("from") or {}
+        append(
+            prefix
+            + (
+                get("id", ""),
+                get("message", ""),
+                get("created_time", ""),
+                author.get("id", ""),
+                author.get("name", ""),
+                int(get("like_count") or 0),
+                int(get("comment_count") or 0),
             )
-            for comment in payload.get("data", []):
-                yield comment
+        )
+    return rows
+
+
+def _next_comments_cursor(first_page: Dict) -> Optional[str]:
+    """Return the cursor to continue an inline comments page from, or ``None`` if it is complete."""
+    total_count = first_page.get("summary", {}).get("total_count")
+    if total_count is not None and total_count <= len(first_page.get("data", [])):
+        # Graph API can hand out a ``next`` link on the last page; the summary tells us
+        # there is nothing left, so skip the extra request.
+        return None
+    paging = first_page.get("paging", {})
+    after = paging.get("cursors", {}).get("after")
+    return after if after and paging.get("next") else None
+
+
+def _fetch_post_comments(client: FacebookClient, post: Dict, first_page: Dict) -> List[RowTuple]:
+    """Return rows for the inline ``first_page`` of comments plus every remaining page."""
+    rows = _build_rows(post, first_page.get("data", []))
+    after = _next_comments_cursor(first_page)
+    if after:
+        rows.extend(_build_rows(post, client.iter_comments(post.get("id", ""), after=after)))
+    return rows
+
+
+def _parse_timestamp(value: str) -> int:
+    """Convert an ISO8601 or Unix epoch timestamp string to Unix seconds (naive times are UTC)."""
+    if value.isdigit():
+        return int(value)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _split_window(since: str, until: str, shards: int) -> List[Tuple[str, str]]:
+    """Split ``[since, until]`` into up to ``shards`` equal, non-overlapping Unix-time windows."""
+    start, end = _parse_timestamp(since), _parse_timestamp(until)
+    shards = max(1, min(shards, end - start))
+    bounds = [start + (end - start) * index // shards for index in range(shards + 1)]
+    # Graph API treats both bounds as inclusive, so each window stops a second short of the next.
+    return [
+        (str(bounds[index]), str(bounds[index + 1] - 1 if index < shards - 1 else end))
+        for index in range(shards)
+    ]
 
-            paging = payload.get("paging", {})
-            cursors = paging.get("cursors", {})
-            after = cursors.get("after")
-            next_url = paging.get("next") if after else None
-            if not next_url:
-                return
+
+def iter_sharded_posts(
+    client: FacebookClient,
+    group_id: str,
+    *,
+    since: str,
+    until: str,
+    shards: int,
+    max_posts: Optional[int] = None,
+) -> Iterator[Dict]:
+    """
+    Iterate through group posts by paging ``shards`` time windows of ``[since, until]`` in parallel.
+
+    Each window is paged by its own thread and posts are yielded as they arrive, so they
+    are not in feed order. ``max_posts`` caps the posts yielded across all windows.
+    """
+    windows = _split_window(since, until, shards)
+    posts: queue.Queue = queue.Queue(maxsize=SHARD_QUEUE_SIZE)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                posts.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def page_window(window_since: str, window_until: str) -> None:
+        try:
+            for post in client.iter_group_posts(group_id, since=window_since, until=window_until):
+                if not put(post):
+                    return
+        except Exception as exc:
+            put(exc)
+        finally:
+            put(finished)
+
+    with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+        for window in windows:
+            executor.submit(page_window, *window)
+        try:
+            remaining = len(windows)
+            fetched = 0
+            while remaining:
+                item = posts.get()
+                if item is finished:
+                    remaining -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                fetched += 1
+                if max_posts is not None and fetched >= max_posts:
+                    return
+        finally:
+            stop.set()
+
+
+def iter_comment_rows(
+    client: FacebookClient,
+    group_id: str,
+    *,
+    since: Optional[str],
+    until: Optional[str],
+    max_posts: Optional[int],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    shards: int = 1,
+) -> Iterator[RowTuple]:
+    """
+    Yield a plain tuple, in CSV column order, for every comment on group posts.
+
+    Each feed page already carries the first page of comments for its posts. Posts with
+    more comments than that are continued in parallel (up to ``concurrency`` at a time)
+    over the client's pooled session, and their rows are yielded as soon as each post
+    finishes, so posts may appear out of feed order. With ``shards`` above one and both
+    ``since`` and ``until`` set, the feed itself is paged through ``iter_sharded_posts``.
+    """
+    if shards > 1 and since and until:
+        posts = iter_sharded_posts(
+            client, group_id, since=since, until=until, shards=shards, max_posts=max_posts
+        )
+    else:
+        posts = client.iter_group_posts(group_id, since=since, until=until, max_posts=max_posts)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: Set[Future] = set()
+        for post in posts:
+            first_page = post.get("comments") or {}
+            if _next_comments_cursor(first_page) is None:
+                yield from _build_rows(post, first_page.get("data", []))
+                continue
+            pending.add(executor.submit(_fetch_post_comments, client, post, first_page))
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
 
 
 def collect_comments(
@@ -166,29 +639,29 @@ def collect_comments(
     since: Optional[str],
     until: Optional[str],
     max_posts: Optional[int],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    shards: int = 1,
 ) -> Iterable[CommentRow]:
-    """Yield ``CommentRow`` objects for all comments on group posts."""
-    for post in client.iter_group_posts(group_id, since=since, until=until, max_posts=max_posts):
-        post_id = post.get("id", "")
-        post_message = post.get("message", "")
-        post_created_time = post.get("created_time", "")
-        for comment in client.iter_comments(post_id):
-            author = comment.get("from", {}) or {}
-            yield CommentRow(
-                post_id=post_id,
-                post_message=post_message,
-                post_created_time=post_created_time,
-                comment_id=comment.get("id", ""),
-                comment_message=comment.get("message", ""),
-                comment_created_time=comment.get("created_time", ""),
-                comment_author_id=author.get("id", ""),
-                comment_author_name=author.get("name", ""),
-                comment_like_count=int(comment.get("like_count", 0) or 0),
-                comment_reply_count=int(comment.get("comment_count", 0) or 0),
-            )
+    """Yield ``CommentRow`` objects for all comments on group posts (see ``iter_comment_rows``)."""
+    for values in iter_comment_rows(
+        client,
+        group_id,
+        since=since,
+        until=until,
+        max_posts=max_posts,
+        concurrency=concurrency,
+        shards=shards,
+    ):
+        yield CommentRow._make(values)
+
+
+class _TextChunk(list):
+    """Text fragments collected in memory; ``csv.writer`` can write into it like a file."""
+
+    write = list.append
 
 
-def write_comments_to_csv(rows: Iterable[CommentRow], output_path: str) -> None:
+def write_comments_to_csv(rows: Iterable[Sequence], output_path: str) -> None:
     headers = [
         "post_id",
         "post_message",
@@ -201,11 +674,37 @@ def write_comments_to_csv(rows: Iterable[CommentRow], output_path: str) -> None:
         "comment_like_count",
         "comment_reply_count",
     ]
-    with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
+    separators = len(headers) - 1
+    with open(output_path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as csvfile:
+        chunk = _TextChunk()
+        writer = csv.writer(chunk)
         writer.writerow(headers)
+        pending = 0
         for row in rows:
-            writer.writerow(row.to_list())
+            # Rows that need no quoting are joined directly; anything with a delimiter,
+            # quote or line break, or a None field (csv writes it as empty), goes through
+            # csv so the output is byte-for-byte the same.
+            if None in row:
+                writer.writerow(row)
+            else:
+                line = ",".join(map(str, row))
+                if line.count(",") == separators and '"' not in line and "\n" not in line and "\r" not in line:
+                    chunk.append(line + "\r\n")
+                else:
+                    writer.writerow(row)
+            pending += 1
+            if pending >= CSV_CHUNK_ROWS:
+                csvfile.write("".join(chunk))
+                chunk.clear()
+                pending = 0
+        csvfile.write("".join(chunk))
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
 
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
@@ -227,6 +726,32 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         type=int,
         help="Optional cap on number of posts to fetch from the group feed",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Number of posts whose remaining comments are fetched in parallel (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--shards",
+        type=_positive_int,
+        default=1,
+        help="Split the --since/--until window into this many parts paged in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            f"Cache Graph API responses in {DEFAULT_CACHE_PATH} so re-runs reuse them (requires "
+            "requests-cache; the file holds response bodies, including paging links with your token)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f"Seconds to reuse cached responses when --cache is set (default: {DEFAULT_CACHE_TTL})",
+    )
     return parser.parse_args(argv)
 
 
@@ -236,14 +761,27 @@ def main(argv: Optional[List[str]] = None) -> int:
     if not access_token:
         print("Error: Provide an access token via --access-token or FB_ACCESS_TOKEN", file=sys.stderr)
         return 1
-
-    client = FacebookClient(access_token=access_token)
-    rows = collect_comments(
+    if args.shards > 1:
+        try:
+            _split_window(args.since or "", args.until or "", args.shards)
+        except ValueError:
+            print("Error: --shards requires --since and --until as ISO8601 or Unix timestamps", file=sys.stderr)
+            return 1
+
+    client = FacebookClient(
+        access_token=access_token,
+        cache_path=DEFAULT_CACHE_PATH if args.cache else None,
+        cache_ttl=args.cache_ttl,
+        pool_maxsize=max(DEFAULT_POOL_MAXSIZE, args.concurrency + args.shards),
+    )
+    rows = iter_comment_rows(
         client,
         args.group_id,
         since=args.since,
         until=args.until,
         max_posts=args.max_posts,
+        concurrency=args.concurrency,
+        shards=args.shards,
     )
     write_comments_to_csv(rows, args.output)
     print(f"Comments exported to {args.output}")